@@ -1,52 +1,34 @@
-import json
+import asyncio
+import os
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+try:
+    import orjson as _json
+except ImportError:  # Fall back to the stdlib parser
+    import json as _json
+
 from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 
 # Create server parameters for stdio connection
 server_params = StdioServerParameters(
     command="python",  # Executable
-    args=["src/mcp_server_simplified.py"],  # Optional command line arguments
+    # Strip asserts and use frozen stdlib modules to cut server start-up time
+    args=["-O", "-X", "frozen_modules=on", "src/server.py"],  # Optional command line arguments
     env=None,  # Optional environment variables
 )
 
+# URL of a separately launched SSE server (e.g. http://127.0.0.1:8000/sse),
+# when unset the client spawns its own server over stdio
+sse_url = os.environ.get("MCP_SSE_URL")
 
-# Optional: create a sampling callback
-async def handle_sampling_message(
-    message: types.CreateMessageRequestParams,
-) -> types.CreateMessageResult:
-    return types.CreateMessageResult(
-        role="assistant",
-        content=types.TextContent(
-            type="text",
-            text="Hello, world! from model",
-        ),
-        model="gpt-3.5-turbo",
-        stopReason="endTurn",
-    )
-
-
-async def main():
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(
-            read, write, sampling_callback=handle_sampling_message
-        ) as session:
-            # Initialize the connection
-            await session.initialize()
-
-            executor_result = await session.call_tool("create_executor")
-
-            if not executor_result:
-                print("Failed to create executor")
-                return
-        
-            executor_id = json.loads(executor_result.content[0].text)["executor_id"]
-            print(f"Executor created successfully: {executor_id}")
-
-            # Create project directory
-            print("Creating project directory...")
-            await session.call_tool("create_directory", {"executor_id": executor_id, "dir_path": "demo_project"})
+loads = _json.loads
 
-            python_code = """
+# Demo sources sent to the executor
+_DEMO_PY = """
 import os
 import sys
 
@@ -63,18 +45,7 @@ with open("output.txt", "w") as f:
 print("Output file created successfully!")
 """
 
-            print("Writing Python file...")
-            await session.call_tool("write_file", {"executor_id": executor_id, "file_path": "demo_project/main.py", "content": python_code})
-            
-            # Execute bash code
-            print("Executing Bash code...")
-            result = await session.call_tool("execute_code", {"executor_id": executor_id, "code": "cd /workspace/demo_project && python main.py", "language": "bash"})
-    
-            print(f"Execution result: {'Success' if json.loads(result.content[0].text)['success'] else 'Failed'}")
-            print(f"Output:\n{json.loads(result.content[0].text)['output']}")
-
-
-            code = '''
+_DEMO_PY_SHORT = """
 import os
 import sys
 
@@ -82,19 +53,94 @@ import sys
 print("Hello from Docker container!")
 print(f"Python version: {sys.version}")
 print(f"Current directory: {os.getcwd()}")
-'''
+"""
+
+_BASH_CMD = "cd /workspace/demo_project && python main.py"
+
+
+def _unwrap(result: types.CallToolResult):
+    """Parse the JSON payload of a tool call result"""
+    return loads(result.content[0].text)
 
-             # Execute Python code
-            print("Executing Python code...")
-            result = await session.call_tool("execute_code", {"executor_id": executor_id, "code": code, "language": "python"})
-    
-            print(f"Execution result: {'Success' if json.loads(result.content[0].text)['success'] else 'Failed'}")
-            print(f"Output:\n{json.loads(result.content[0].text)['output']}")
 
+def _connect():
+    """Open the client transport, preferring SSE over stdio when configured"""
+    if sse_url:
+        return sse_client(sse_url)
+    return stdio_client(server_params)
 
-            await session.call_tool("delete_executor", {"executor_id": executor_id}) 
+
+def _emit(lines: list[str]) -> None:
+    """Write a batch of output lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+@asynccontextmanager
+async def get_session() -> AsyncIterator[ClientSession]:
+    """
+    Open an initialized client session to the server
+
+    The session can be reused for any number of tool calls, so callers that
+    run several demos only pay the server start-up cost once.
+    """
+    async with _connect() as (read, write):
+        # No sampling callback: the demo tools never request sampling
+        async with ClientSession(read, write) as session:
+            # Initialize the connection
+            await session.initialize()
+            yield session
+
+
+async def run_demo(session: ClientSession) -> None:
+    """Run the demo against an already initialized session"""
+    call = session.call_tool
+
+    executor_result = await call("create_executor")
+
+    if not executor_result:
+        print("Failed to create executor")
+        return
+
+    executor_id = _unwrap(executor_result)["executor_id"]
+    _emit([f"Executor created successfully: {executor_id}"])
+
+    try:
+        # Create project directory and write the Python file concurrently,
+        # write_file creates missing parent directories itself
+        _emit(["Creating project directory...", "Writing Python file..."])
+        await asyncio.gather(
+            call("create_directory", {"executor_id": executor_id, "dir_path": "demo_project"}),
+            call("write_file", {"executor_id": executor_id, "file_path": "demo_project/main.py", "content": _DEMO_PY}),
+        )
+
+        # Execute bash and Python code concurrently, results are reported in order
+        _emit(["Executing Bash code...", "Executing Python code..."])
+        bash_result, python_result = await asyncio.gather(
+            call("execute_code", {"executor_id": executor_id, "code": _BASH_CMD, "language": "bash"}),
+            call("execute_code", {"executor_id": executor_id, "code": _DEMO_PY_SHORT, "language": "python"}),
+        )
+
+        _emit([
+            f"Execution result: {'Success' if payload['success'] else 'Failed'}\nOutput:\n{payload['output']}"
+            for payload in map(_unwrap, (bash_result, python_result))
+        ])
+    finally:
+        # Always release the executor, even if a tool call fails
+        await call("delete_executor", {"executor_id": executor_id})
+
+
+async def main():
+    async with get_session() as session:
+        await run_demo(session)
 
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main()) 
+    # Prefer uvloop's libuv-based event loop when it is available
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
+    asyncio.run(main(), loop_factory=loop_factory)
@@ -8,16 +8,27 @@ It provides a set of tools that allow clients to create Docker containers, execu
 """
 
 import asyncio
+import codecs
 import docker
+import inspect
+import io
 import logging
 import os
-import re
+import socket
+import tarfile
+import threading
+import time
 import uuid
 from contextlib import asynccontextmanager
+from collections import deque
 from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Union
-import base64
+from functools import lru_cache, wraps
+from typing import Awaitable, Callable, Deque, Dict, Any, List, Optional, Tuple, Union
+
+from docker.models.containers import ExecResult
+from docker.utils.socket import STDOUT, consume_socket_output, frames_iter
 
 # Import MCP library
 from mcp.server.fastmcp import Context, FastMCP
@@ -30,7 +41,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_docker_server")
 
+# Paths may only contain word characters and "-", "/", "." or " ". These are
+# the ASCII bytes to delete; non-ASCII characters are checked with
+# str.isalnum(), matching what the regex \w class allows.
+_SANITIZE_DELETE = bytes(
+    c for c in range(128) if not (chr(c).isalnum() or chr(c) in "_-/. ")
+)
+
+# Most recent bytes of each output stream kept for an execute_code result
+MAX_OUTPUT_BYTES = 1024 * 1024
+
+# Symlinks followed by read_file before giving up, as the kernel's ELOOP limit
+MAX_SYMLINK_HOPS = 40
+
+# Go os.FileMode bits in the stat header returned by get_archive
+FILE_MODE_SYMLINK = 1 << 27
+# Any type bit (directory, symlink, device, pipe, socket, ...) means not a regular file
+FILE_MODE_TYPE = (1 << 31) | FILE_MODE_SYMLINK | (1 << 26) | (1 << 25) | (1 << 24) | (1 << 21) | (1 << 19)
+
+# Command prefixes and shell scripts used inside containers. Paths and data are
+# passed as arguments or environment variables, never formatted into the script.
+MKDIR_CMD = ("mkdir", "-p")
+
+# Fallback write for write_file: copies stdin into file $F
+WRITE_FILE_SCRIPT = 'cat > "$F" && chmod 666 "$F"'
+
+# Shell script behind project_structure, run with the target directory in $P
+# and, once known, whether tree is installed in $HAS_TREE ("1" or "0").
+# The first output line tells the caller which branch produced the rest.
+PROJECT_STRUCTURE_SCRIPT = """
+test -d "$P" || { echo __NODIR__; exit 3; }
+if [ -z "$HAS_TREE" ]; then
+    command -v tree >/dev/null 2>&1 && HAS_TREE=1 || HAS_TREE=0
+fi
+if [ "$HAS_TREE" = 1 ]; then
+    echo __TREE__
+    tree "$P"
+else
+    echo __FIND__
+    find "$P" \\( -type d -o -type f \\) -printf "%y %P\\n"
+fi
+"""
+
 # Utility functions
+@lru_cache(maxsize=1024)
 def sanitize_path(path: str) -> str:
     """
     Sanitize path to prevent path traversal attacks
@@ -41,84 +95,470 @@ def sanitize_path(path: str) -> str:
     Returns:
         Sanitized path
     """
-    # Remove all "../" patterns, only allow basic alphanumeric characters and some safe symbols
-    sanitized = re.sub(r'\.\./', '', path)
-    sanitized = re.sub(r'[^\w\d\-_/. ]', '', sanitized)
+    # Only allow basic alphanumeric characters and some safe symbols,
+    # bytes.translate is far cheaper than str.translate or a regex here
+    if path.isascii():
+        sanitized = path.encode('ascii').translate(None, _SANITIZE_DELETE).decode('ascii')
+    else:
+        sanitized = "".join(
+            c for c in path
+            if (not c.isascii() and c.isalnum()) or (c.isascii() and ord(c) not in _SANITIZE_DELETE)
+        )
+    # Drop all ".." components, so no sequence of characters can climb out
+    if ".." in sanitized:
+        sanitized = "/".join(part for part in sanitized.split("/") if part != "..")
     # Ensure path doesn't start with "/" (prevent absolute paths)
-    while sanitized.startswith('/'):
-        sanitized = sanitized[1:]
-    return sanitized
+    return sanitized.lstrip('/')
+
+@lru_cache(maxsize=None)
+def ensure_image(client: docker.DockerClient, docker_image: str) -> None:
+    """
+    Ensure a Docker image is available locally, pulling it if necessary
+    
+    Results are cached per client and image, so the check only hits the
+    Docker daemon once per image.
+    
+    Args:
+        client: Docker client to use
+        docker_image: Docker image to check
+    """
+    try:
+        client.images.get(docker_image)
+        logger.info(f"Found image {docker_image}")
+    except docker.errors.ImageNotFound:
+        logger.info(f"Pulling image {docker_image}...")
+        client.images.pull(docker_image)
+
+def make_tar(name: str, data: bytes, mode: int) -> bytes:
+    """
+    Build an in-memory tar archive holding a single file
+    
+    Args:
+        name: File path inside the archive
+        data: File content
+        mode: File permission bits
+        
+    Returns:
+        The tar archive as bytes
+    """
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        info = tarfile.TarInfo(name=name)
+        info.size = len(data)
+        info.mode = mode
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+def run_container(client: docker.DockerClient, docker_image: str):
+    """
+    Start a new idle container with the executor security settings
+    
+    Args:
+        client: Docker client to use
+        docker_image: Docker image to use
+        
+    Returns:
+        The started container
+    """
+    container = client.containers.run(
+        docker_image,
+        command="tail -f /dev/null",  # Keep container running
+        detach=True,
+        remove=True,  # Auto-remove container after stopping
+        working_dir="/workspace",  # Working directory, created by Docker if missing
+        # Security settings
+        cap_drop=["ALL"],  # Remove all Linux capabilities
+        security_opt=["no-new-privileges:true"],  # Prevent gaining new privileges
+        mem_limit="256m",  # Memory limit
+        cpu_count=1,  # CPU limit
+    )
+    
+    return container
+
+class OutputBuffer:
+    """Keeps the most recent bytes of an output stream, up to a size limit"""
+    
+    def __init__(self, limit: int = MAX_OUTPUT_BYTES):
+        """
+        Initialize output buffer
+        
+        Args:
+            limit: Maximum number of bytes to keep
+        """
+        self.limit = limit
+        self.size = 0
+        self.truncated = False
+        self._chunks: Deque[bytes] = deque()
+    
+    def append(self, chunk: bytes) -> None:
+        """Add a chunk, dropping the oldest bytes beyond the limit"""
+        self._chunks.append(chunk)
+        self.size += len(chunk)
+        
+        while self.size > self.limit:
+            self.truncated = True
+            head = self._chunks[0]
+            excess = self.size - self.limit
+            if len(head) <= excess:
+                self._chunks.popleft()
+                self.size -= len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                self.size -= excess
+    
+    def getvalue(self) -> bytes:
+        """Get the kept bytes, marked if older output was dropped"""
+        data = b"".join(self._chunks)
+        if self.truncated:
+            data = b"... (output truncated) ...\n" + data
+        return data
+
+class ExecCancel:
+    """Lets another thread stop reading the output of a streaming exec"""
+    
+    def __init__(self):
+        """Initialize exec cancellation"""
+        self.cancelled = False
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+    
+    def attach(self, sock: socket.socket) -> bool:
+        """
+        Register the socket the exec output is read from
+        
+        Args:
+            sock: Raw socket of the exec
+            
+        Returns:
+            False if the exec was already cancelled
+        """
+        with self._lock:
+            self._sock = sock
+            return not self.cancelled
+    
+    def cancel(self) -> None:
+        """Stop the exec, waking up a reader blocked on its socket"""
+        with self._lock:
+            self.cancelled = True
+            if self._sock is not None:
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # Already closed by the reader
+
+class ContainerPool:
+    """
+    Pool of pre-started idle containers, keyed by image
+    
+    Only images passed to warm() are pooled. Containers are handed out once
+    and never returned, so no state carries over between executors.
+    """
+    
+    def __init__(self, client: docker.DockerClient, size: int = 2, idle_timeout: float = 600):
+        """
+        Initialize container pool
+        
+        Args:
+            client: Docker client used to start containers
+            size: Number of idle containers to keep per image
+            idle_timeout: Seconds after which an idle container is evicted
+        """
+        self.client = client
+        self.size = size
+        self.idle_timeout = idle_timeout
+        # Idle containers per warmed image, each stored with the time it became idle
+        self._idle: Dict[str, Deque[Tuple[float, Any]]] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._evictor: Optional[asyncio.Task] = None
+        # Guards _closed against container starts finishing in worker threads
+        self._closing = threading.Lock()
+        self._closed = False
+    
+    def warm(self, docker_image: str) -> None:
+        """Keep idle containers ready for an image"""
+        if self._closed or self.size <= 0:
+            return
+        self._idle.setdefault(docker_image, deque())
+        if self._evictor is None:
+            self._evictor = asyncio.create_task(self._evict_idle())
+        self.refill(docker_image)
+    
+    def refill(self, docker_image: str) -> None:
+        """Top up the idle containers of a warmed image in the background"""
+        if self._closed or docker_image not in self._idle:
+            return
+        task = self._refills.get(docker_image)
+        if task is None or task.done():
+            self._refills[docker_image] = asyncio.create_task(self._fill(docker_image))
+    
+    async def _fill(self, docker_image: str) -> None:
+        """Start containers until the image has `size` idle containers"""
+        idle = self._idle[docker_image]
+        loop = asyncio.get_running_loop()
+        
+        def start_container():
+            ensure_image(self.client, docker_image)
+            container = run_container(self.client, docker_image)
+            with self._closing:
+                if not self._closed:
+                    idle.append((time.monotonic(), container))
+                    return container
+            # The pool was closed while the container was starting
+            container.stop(timeout=2)
+            return None
+        
+        try:
+            while not self._closed and len(idle) < self.size:
+                container = await loop.run_in_executor(None, start_container)
+                if container is not None:
+                    logger.info(f"Warmed container {container.short_id} for {docker_image}")
+        except Exception as e:
+            logger.error(f"Error warming containers for {docker_image}: {e}")
+    
+    async def _evict_idle(self) -> None:
+        """Periodically stop containers that have been idle for too long"""
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            deadline = time.monotonic() - self.idle_timeout
+            
+            for idle in self._idle.values():
+                # Containers are appended as they become idle, oldest first
+                while idle and idle[0][0] < deadline:
+                    _, container = idle.popleft()
+                    await self._stop(container)
+    
+    def acquire(self, docker_image: str):
+        """
+        Take an idle container for an image
+        
+        Args:
+            docker_image: Docker image of the container
+            
+        Returns:
+            A running container, or None if no idle container is available
+        """
+        idle = self._idle.get(docker_image)
+        container = idle.popleft()[1] if idle else None
+        self.refill(docker_image)
+        return container
+    
+    async def _stop(self, container) -> None:
+        """Stop a container without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, lambda: container.stop(timeout=2))
+            logger.info(f"Idle container {container.short_id} has been stopped")
+        except Exception as e:
+            logger.error(f"Error stopping idle container: {e}")
+    
+    async def close(self) -> None:
+        """Stop background tasks and all idle containers"""
+        # Containers still starting are stopped by their worker thread
+        with self._closing:
+            self._closed = True
+            containers = [container for idle in self._idle.values() for _, container in idle]
+            self._idle.clear()
+        
+        for task in (*self._refills.values(), self._evictor):
+            if task is not None:
+                task.cancel()
+        self._refills.clear()
+        self._evictor = None
+        
+        for container in containers:
+            await self._stop(container)
 
 class DockerExecutor:
     """Docker Code Executor"""
     
-    def __init__(self, docker_image: str = "python:3-slim", timeout: int = 30):
+    def __init__(
+        self,
+        docker_image: str = "python:3-slim",
+        timeout: int = 30,
+        client: Optional[docker.DockerClient] = None,
+        pool: Optional[ContainerPool] = None
+    ):
         """
         Initialize Docker code executor
         
         Args:
             docker_image: Docker image to use
             timeout: Code execution timeout in seconds
+            client: Shared Docker client, a new one is created if omitted
+            pool: Pool of warm containers to take from
         """
         self.docker_image = docker_image
         self.timeout = timeout
-        self.client = docker.from_env()
+        self.client = client or docker.from_env()
+        self.pool = pool
+        # Whether the image ships the tree command, detected on first use
+        self._has_tree: Optional[bool] = None
+        # Dedicated threads for blocking Docker calls, created on first use
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
         self.container = None
         self.id = str(uuid.uuid4())
-        
-        # Ensure image exists
-        try:
-            self.client.images.get(docker_image)
-            logger.info(f"Found image {docker_image}")
-        except docker.errors.ImageNotFound:
-            logger.info(f"Pulling image {docker_image}...")
-            self.client.images.pull(docker_image)
     
     async def start(self) -> None:
         """Start Docker container"""
         if self.container is not None:
             return
             
-        # Create container
-        self.container = self.client.containers.run(
-            self.docker_image,
-            command="tail -f /dev/null",  # Keep container running
-            detach=True,
-            remove=True,  # Auto-remove container after stopping
-            working_dir="/workspace",  # Working directory
-            # Security settings
-            cap_drop=["ALL"],  # Remove all Linux capabilities
-            security_opt=["no-new-privileges:true"],  # Prevent gaining new privileges
-            mem_limit="256m",  # Memory limit
-            cpu_count=1,  # CPU limit
-        )
+        # Prefer a warm container, fall back to a cold start
+        if self.pool is not None:
+            self.container = self.pool.acquire(self.docker_image)
+            if self.container is not None:
+                logger.info(f"Took warm container {self.container.short_id}")
+                return
         
-        # Create working directory
-        self.container.exec_run(
-            ["mkdir", "-p", "/workspace"],
-            user="root"
+        self.container = await self._run_blocking(
+            lambda: run_container(self.client, self.docker_image)
         )
         
         logger.info(f"Started container {self.container.short_id}")
     
     async def stop(self) -> None:
         """Stop and clean up Docker container"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        
         if self.container is not None:
+            # Containers are never reused, the pool starts fresh ones instead.
+            # Stopped on the default executor, the executor's own threads may
+            # be busy with exec streams that only end once the container stops.
+            container = self.container
+            loop = asyncio.get_running_loop()
             try:
-                self.container.stop(timeout=2)
-                logger.info(f"Container {self.container.short_id} has been stopped")
+                await loop.run_in_executor(None, lambda: container.stop(timeout=2))
+                logger.info(f"Container {container.short_id} has been stopped")
             except Exception as e:
                 logger.error(f"Error stopping container: {e}")
             finally:
                 self.container = None
     
-    async def execute_code(self, code: str, language: str) -> Dict[str, Any]:
+    async def _run_blocking(self, func):
+        """
+        Run a blocking Docker call on the executor's own thread pool
+        
+        Args:
+            func: Callable to run
+            
+        Returns:
+            Result of the callable
+        """
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=4,
+                thread_name_prefix=f"docker-{self.id[:6]}"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool, func)
+    
+    def _exec(self, cmd, exit_code: bool = True, demux: bool = False, **kwargs) -> ExecResult:
+        """
+        Run a command in the container through the low-level exec API
+        
+        Unlike Container.exec_run, the exec_inspect round-trip is only made
+        when the caller needs the exit code.
+        
+        Args:
+            cmd: Command to run
+            exit_code: Whether to fetch the exit code
+            demux: Whether to return stdout and stderr separately
+            **kwargs: Extra exec_create arguments (user, workdir, environment, ...)
+            
+        Returns:
+            ExecResult with the exit code (None if not fetched) and output
+        """
+        api = self.client.api
+        exec_id = api.exec_create(self.container.id, cmd, **kwargs)["Id"]
+        output = api.exec_start(exec_id, demux=demux)
+        code = api.exec_inspect(exec_id)["ExitCode"] if exit_code else None
+        return ExecResult(code, output)
+    
+    def _exec_stdin(self, cmd, data: bytes, **kwargs) -> ExecResult:
+        """
+        Run a command in the container with data written to its stdin
+        
+        Args:
+            cmd: Command to run
+            data: Bytes to send to the command's stdin
+            **kwargs: Extra exec_create arguments (user, workdir, environment, ...)
+            
+        Returns:
+            ExecResult with the exit code and combined output
+        """
+        api = self.client.api
+        exec_id = api.exec_create(self.container.id, cmd, stdin=True, **kwargs)["Id"]
+        sock = api.exec_start(exec_id, socket=True)
+        try:
+            # exec_start returns a SocketIO wrapper around the raw socket
+            raw = getattr(sock, "_sock", sock)
+            raw.sendall(data)
+            raw.shutdown(socket.SHUT_WR)
+            output = consume_socket_output(frames_iter(sock, tty=False))
+        finally:
+            sock.close()
+        return ExecResult(api.exec_inspect(exec_id)["ExitCode"], output)
+    
+    def _exec_stream(
+        self,
+        cmd,
+        on_chunk: Optional[Callable[[Optional[bytes], Optional[bytes]], None]] = None,
+        cancel: Optional[ExecCancel] = None,
+        **kwargs
+    ) -> ExecResult:
+        """
+        Run a command in the container, consuming its output as it is produced
+        
+        Only the last MAX_OUTPUT_BYTES of stdout and stderr are kept.
+        
+        Args:
+            cmd: Command to run
+            on_chunk: Called with each (stdout, stderr) chunk pair as it arrives
+            cancel: Stops reading output once cancelled from another thread
+            **kwargs: Extra exec_create arguments (user, workdir, environment, ...)
+            
+        Returns:
+            ExecResult with the exit code (None if cancelled) and a (stdout, stderr) output tuple
+        """
+        api = self.client.api
+        exec_id = api.exec_create(self.container.id, cmd, **kwargs)["Id"]
+        buffers = (OutputBuffer(), OutputBuffer())
+        
+        sock = api.exec_start(exec_id, socket=True)
+        try:
+            # exec_start returns a SocketIO wrapper around the raw socket
+            if cancel is None or cancel.attach(getattr(sock, "_sock", sock)):
+                for stream, data in frames_iter(sock, tty=False):
+                    if cancel is not None and cancel.cancelled:
+                        break
+                    chunks = (data, None) if stream == STDOUT else (None, data)
+                    buffers[stream != STDOUT].append(data)
+                    if on_chunk is not None:
+                        on_chunk(*chunks)
+        finally:
+            sock.close()
+        
+        output = tuple(buffer.getvalue() for buffer in buffers)
+        if cancel is not None and cancel.cancelled:
+            return ExecResult(None, output)
+        return ExecResult(api.exec_inspect(exec_id)["ExitCode"], output)
+    
+    async def execute_code(
+        self,
+        code: str,
+        language: str,
+        on_output: Optional[Callable[[str], Awaitable[Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Execute code in Docker container
         
         Args:
             code: Code to execute
             language: Code language (python, bash, etc.)
+            on_output: Coroutine function called with output text as it is produced
             
         Returns:
             Dictionary containing execution results
@@ -131,36 +571,56 @@ class DockerExecutor:
             else:
                 cmd = ["bash", "-c", code]
             
+            # Forward output chunks to the event loop as they arrive,
+            # incremental decoders keep multi-byte characters split across chunks intact
+            loop = asyncio.get_running_loop()
+            decoders = [codecs.getincrementaldecoder('utf-8')(errors='replace') for _ in range(2)]
+            cancel = ExecCancel()
+            
+            def forward_output(*chunks):
+                text = "".join(
+                    decoder.decode(chunk) for decoder, chunk in zip(decoders, chunks) if chunk
+                )
+                if text and not cancel.cancelled:
+                    # Wait until each message is sent, so a chatty process is read
+                    # at the client's pace instead of piling messages onto the loop
+                    try:
+                        asyncio.run_coroutine_threadsafe(on_output(text), loop).result()
+                    except Exception as e:
+                        logger.warning(f"Could not forward output: {e}")
+            
             # Run command in sync way
             def docker_exec_run():
-                return self.container.exec_run(
+                return self._exec_stream(
                     cmd,
+                    forward_output if on_output is not None else None,
+                    cancel,
                     workdir="/workspace",
-                    demux=True,
                     privileged=False,
                     user="root",
                     tty=False,
                     environment={},
                 )
             
-            # Get current event loop and execute Docker operation in thread pool
-            loop = asyncio.get_event_loop()
-            result = await asyncio.wait_for(
-                loop.run_in_executor(None, docker_exec_run),
-                timeout=self.timeout
-            )
+            # Execute Docker operation in the executor's thread pool
+            try:
+                result = await asyncio.wait_for(
+                    self._run_blocking(docker_exec_run),
+                    timeout=self.timeout
+                )
+            finally:
+                # Release the worker thread if the call timed out or was cancelled
+                cancel.cancel()
             
             # Process results
             exit_code = result.exit_code
             stdout = result.output[0] or b""
             stderr = result.output[1] or b""
             
-            stdout_str = stdout.decode('utf-8', errors='replace')
-            stderr_str = stderr.decode('utf-8', errors='replace')
-            
-            output = stdout_str
-            if stderr_str:
-                output += "\n--- stderr ---\n" + stderr_str
+            # Join the raw streams first so the output is decoded only once
+            if stderr:
+                stdout = b"".join((stdout, b"\n--- stderr ---\n", stderr))
+            output = stdout.decode('utf-8', errors='replace')
             
             return {
                 "output": output,
@@ -197,31 +657,46 @@ class DockerExecutor:
         
         # Sanitize file path
         safe_path = sanitize_path(file_path)
+        content_bytes = content.encode('utf-8')
+        
+        # Upload the file as an in-memory tar archive, missing parent
+        # directories are created by Docker when the archive is extracted
+        def docker_put_archive():
+            return self.container.put_archive(
+                "/workspace",
+                make_tar(safe_path, content_bytes, 0o666)
+            )
+        
+        try:
+            if await self._run_blocking(docker_put_archive):
+                return {
+                    "success": True,
+                    "message": f"File {file_path} created in container"
+                }
+        except Exception as e:
+            logger.warning(f"put_archive failed, falling back to shell write: {e}")
         
         try:
             # Ensure directory exists
             dir_path = os.path.dirname(f"/workspace/{safe_path}")
             if dir_path != "/workspace":
-                mkdir_result = self.container.exec_run(
-                    ["bash", "-c", f"mkdir -p {dir_path}"],
+                mkdir_result = await self._run_blocking(lambda: self._exec(
+                    [*MKDIR_CMD, dir_path],
                     user="root"
-                )
+                ))
                 if mkdir_result.exit_code != 0:
                     return {
                         "success": False,
                         "message": f"Error creating directory: {mkdir_result.output.decode('utf-8', errors='replace')}"
                     }
             
-            # Use echo command to create file in container
-            # Base64 encode the content to handle special characters and multiline text
-            encoded_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-            
-            # Use base64 to decode and write to file
-            write_cmd = f"echo '{encoded_content}' | base64 -d > /workspace/{safe_path} && chmod 666 /workspace/{safe_path}"
-            result = self.container.exec_run(
-                ["bash", "-c", write_cmd],
-                user="root"
-            )
+            # Stream the raw content to the write script's stdin
+            result = await self._run_blocking(lambda: self._exec_stdin(
+                ["sh", "-c", WRITE_FILE_SCRIPT],
+                content_bytes,
+                user="root",
+                environment={"F": f"/workspace/{safe_path}"}
+            ))
             
             if result.exit_code != 0:
                 return {
@@ -255,32 +730,48 @@ class DockerExecutor:
         # Sanitize file path
         safe_path = sanitize_path(file_path)
         
+        # Fetch the file as a tar archive and extract its single member
+        def docker_get_archive():
+            archive_path = f"/workspace/{safe_path}"
+            # The stat header is checked before the archive is read, so directories
+            # are rejected without downloading them and symlinks are followed like cat
+            for _hop in range(MAX_SYMLINK_HOPS):
+                stream, stat = self.container.get_archive(archive_path)
+                mode = stat["mode"] if stat else 0
+                if mode & FILE_MODE_SYMLINK and stat.get("linkTarget"):
+                    stream.close()
+                    archive_path = os.path.normpath(
+                        os.path.join(os.path.dirname(archive_path), stat["linkTarget"])
+                    )
+                    continue
+                if mode & FILE_MODE_TYPE:
+                    stream.close()
+                    return None
+                
+                buf = io.BytesIO()
+                for chunk in stream:
+                    buf.write(chunk)
+                buf.seek(0)
+                with tarfile.open(fileobj=buf, mode="r|") as tar:
+                    member = tar.next()
+                    if member is None or not member.isfile():
+                        return None
+                    return tar.extractfile(member).read()
+            return None
+        
         try:
-            # Check if file exists
-            check_result = self.container.exec_run(
-                ["bash", "-c", f"[ -f /workspace/{safe_path} ] && echo 'exists' || echo 'not_exists'"],
-                user="root"
-            )
+            try:
+                data = await self._run_blocking(docker_get_archive)
+            except docker.errors.NotFound:
+                data = None
             
-            if check_result.output.decode('utf-8', errors='replace').strip() != 'exists':
+            if data is None:
                 return {
                     "success": False,
                     "message": f"File {file_path} does not exist in container"
                 }
             
-            # Read file content
-            result = self.container.exec_run(
-                ["cat", f"/workspace/{safe_path}"],
-                user="root"
-            )
-            
-            if result.exit_code != 0:
-                return {
-                    "success": False,
-                    "message": f"Error reading file: {result.output.decode('utf-8', errors='replace')}"
-                }
-            
-            content = result.output.decode('utf-8', errors='replace')
+            content = data.decode('utf-8', errors='replace')
             
             return {
                 "success": True,
@@ -310,11 +801,11 @@ class DockerExecutor:
         
         try:
             # List directory contents
-            result = self.container.exec_run(
+            result = await self._run_blocking(lambda: self._exec(
                 ["ls", "-la", f"/workspace/{safe_path}"],
                 workdir="/workspace",
                 user="root"
-            )
+            ))
             
             if result.exit_code != 0:
                 return {
@@ -351,11 +842,11 @@ class DockerExecutor:
         safe_path = sanitize_path(dir_path)
         
         try:
-            result = self.container.exec_run(
-                ["bash", "-c", f"mkdir -p /workspace/{safe_path} && chmod -R 777 /workspace/{safe_path}"],
+            result = await self._run_blocking(lambda: self._exec(
+                [*MKDIR_CMD, f"/workspace/{safe_path}"],
                 workdir="/workspace",
                 user="root"
-            )
+            ))
             
             if result.exit_code != 0:
                 return {
@@ -390,70 +881,63 @@ class DockerExecutor:
         safe_path = sanitize_path(path)
         
         try:
-            # Check if directory exists
-            check_result = self.container.exec_run(
-                ["bash", "-c", f"[ -d /workspace/{safe_path} ] && echo 'exists' || echo 'not_exists'"],
-                user="root"
-            )
+            # Check the directory, then run tree or fall back to find, all in one exec
+            result = await self._run_blocking(lambda: self._exec(
+                ["bash", "-c", PROJECT_STRUCTURE_SCRIPT],
+                exit_code=False,  # Outcome is reported through the output marker
+                workdir="/workspace",
+                user="root",
+                environment={
+                    "P": f"/workspace/{safe_path}",
+                    "HAS_TREE": "" if self._has_tree is None else str(int(self._has_tree))
+                }
+            ))
             
-            if check_result.output.decode('utf-8', errors='replace').strip() != 'exists':
+            # Compare the marker as bytes and only decode the listing itself
+            marker, _, output = result.output.partition(b"\n")
+            
+            if marker == b"__NODIR__":
                 return {
                     "success": False,
                     "message": f"Directory {path} does not exist in container"
                 }
             
-            # First try using tree command
-            tree_result = self.container.exec_run(
-                ["which", "tree"],
-                workdir="/workspace",
-                user="root"
-            )
+            if marker not in (b"__TREE__", b"__FIND__"):
+                # The script did not run (e.g. no bash in the image), don't
+                # remember anything about tree from this output
+                return {
+                    "success": False,
+                    "message": f"Error getting project structure: {result.output.decode('utf-8', errors='replace').strip()}"
+                }
             
-            if tree_result.exit_code == 0:
-                # Tree command exists in container, use it directly
-                result = self.container.exec_run(
-                    ["tree", f"/workspace/{safe_path}"],
-                    workdir="/workspace",
-                    user="root"
-                )
-                tree_output = result.output.decode('utf-8', errors='replace')
-                
+            self._has_tree = marker == b"__TREE__"
+            output = output.decode('utf-8', errors='replace')
+            
+            if self._has_tree:
+                # Tree command exists in container, use its output directly
                 return {
                     "success": True,
-                    "tree": tree_output,
+                    "tree": output,
                     "files": []  # Keep for compatibility
                 }
             else:
-                # Recursively get file list using find command
-                find_result = self.container.exec_run(
-                    ["find", f"/workspace/{safe_path}", "-type", "f", "-o", "-type", "d"],
-                    workdir="/workspace",
-                    user="root"
-                )
-                
-                output = find_result.output.decode('utf-8', errors='replace')
-                file_paths = [line.replace("/workspace/", "", 1) for line in output.splitlines() if line.strip()]
-                
-                # Get file type information
-                ls_result = self.container.exec_run(
-                    ["find", f"/workspace/{safe_path}", "-type", "d", "-o", "-type", "f", "-printf", "%y %P\n"],
-                    workdir="/workspace",
-                    user="root"
-                )
-                
-                ls_output = ls_result.output.decode('utf-8', errors='replace')
+                # Get file list and type information from the single find pass,
+                # paths are made relative to the working directory
+                base = safe_path.rstrip("/")
+                file_paths = []
                 file_types = {}
                 
-                for line in ls_output.splitlines():
+                for line in output.splitlines():
                     if not line.strip():
                         continue
                     
                     file_type, file_path = line.split(" ", 1)
-                    if file_path.startswith(f"{safe_path}/"):
-                        file_path = file_path[len(f"{safe_path}/"):]
-                    elif file_path == safe_path:
-                        file_path = ""
+                    if base and file_path:
+                        file_path = f"{base}/{file_path}"
+                    elif not file_path:
+                        file_path = base
                     
+                    file_paths.append(file_path)
                     file_types[file_path] = "d" if file_type == "d" else "f"
                 
                 # Build tree structure
@@ -482,43 +966,90 @@ class DockerExecutor:
 class ExecutorManager:
     """Executor Manager"""
     
-    def __init__(self):
-        """Initialize executor manager"""
+    def __init__(self, pool_size: int = 2, pool_idle_timeout: float = 600):
+        """
+        Initialize executor manager
+        
+        Args:
+            pool_size: Number of warm containers to keep per prewarmed image
+            pool_idle_timeout: Seconds after which a warm container is evicted
+        """
+        # Reads are lock-free dict lookups, mutations go through self._lock
         self.executors: Dict[str, DockerExecutor] = {}
+        self._lock = asyncio.Lock()
+        # Single Docker client shared by all executors
+        self.docker_client = docker.from_env()
+        self.pool = ContainerPool(self.docker_client, pool_size, pool_idle_timeout)
+        # In-flight or finished image checks, shared by concurrent creates
+        self._images: Dict[str, asyncio.Future] = {}
     
     def get_executor(self, executor_id: str) -> Optional[DockerExecutor]:
         """Get executor"""
         return self.executors.get(executor_id)
     
+    def _ensure_image(self, docker_image: str) -> asyncio.Future:
+        """Get the shared future that makes sure an image is available locally"""
+        future = self._images.get(docker_image)
+        if future is None or (future.done() and (future.cancelled() or future.exception() is not None)):
+            # Check (and pull) off the event loop, failed checks are retried on next use
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, ensure_image, self.docker_client, docker_image)
+            self._images[docker_image] = future
+        return future
+    
+    def prewarm(self, *docker_images: str) -> None:
+        """Pull images and warm containers for them in the background"""
+        for docker_image in docker_images:
+            self._ensure_image(docker_image).add_done_callback(
+                lambda future, docker_image=docker_image: self._refill_when_ready(docker_image, future)
+            )
+    
+    def _refill_when_ready(self, docker_image: str, future: asyncio.Future) -> None:
+        """Warm containers for an image once its check has succeeded"""
+        if future.cancelled() or future.exception() is not None:
+            logger.error(f"Could not prewarm image {docker_image}")
+            return
+        self.pool.warm(docker_image)
+    
     async def create_executor(self, docker_image: str = "python:3-slim", timeout: int = 30) -> DockerExecutor:
         """Create new executor"""
-        executor = DockerExecutor(docker_image, timeout)
-        self.executors[executor.id] = executor
+        # Shielded so a cancelled request does not cancel a pull others wait on
+        await asyncio.shield(self._ensure_image(docker_image))
+        executor = DockerExecutor(docker_image, timeout, self.docker_client, self.pool)
+        async with self._lock:
+            self.executors[executor.id] = executor
         await executor.start()
         return executor
     
     async def delete_executor(self, executor_id: str) -> bool:
         """Delete executor"""
-        executor = self.get_executor(executor_id)
+        # Unregister first, so concurrent deletes of the same ID stop it only once
+        async with self._lock:
+            executor = self.executors.pop(executor_id, None)
         if executor is None:
             return False
             
         await executor.stop()
-        del self.executors[executor_id]
         return True
     
     async def cleanup(self) -> None:
         """Clean up all executors"""
-        logger.info(f"Cleaning up {len(self.executors)} executors")
+        # Take a snapshot and empty the map, executors are stopped outside the lock
+        async with self._lock:
+            executors = list(self.executors.items())
+            self.executors.clear()
+        
+        logger.info(f"Cleaning up {len(executors)} executors")
         
-        for executor_id, executor in list(self.executors.items()):
+        for executor_id, executor in executors:
             try:
                 await executor.stop()
                 logger.info(f"Executor {executor_id} has been stopped")
             except Exception as e:
                 logger.error(f"Error cleaning up executor {executor_id}: {e}")
         
-        self.executors.clear()
+        await self.pool.close()
+        self.docker_client.close()
 
 @dataclass
 class AppContext:
@@ -536,9 +1067,17 @@ async def lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     Yields:
         Application context
     """
+    # Warm containers kept for the default image. Off by default in stdio mode,
+    # where every client spawns its own short-lived server.
+    sse_mode = os.environ.get("MCP_SSE_MODE", "false").lower() == "true"
+    pool_size = int(os.environ.get("MCP_POOL_SIZE", "2" if sse_mode else "0"))
+    
     # Initialize resources
-    manager = ExecutorManager()
+    manager = ExecutorManager(pool_size=pool_size)
     logger.info("Initializing executor manager")
+    if pool_size > 0:
+        # Pull and warm containers for the default image in the background
+        manager.prewarm("python:3-slim")
     
     try:
         yield AppContext(manager=manager)
@@ -554,6 +1093,45 @@ app = FastMCP(
     lifespan=lifespan
 )
 
+# Returned by tools whose executor_id is unknown, shared and never mutated
+EXECUTOR_NOT_FOUND = {
+    "success": False,
+    "message": "Executor not found"
+}
+
+def with_executor(func):
+    """
+    Resolve the executor_id argument of a tool to its executor
+    
+    The decorated function takes the DockerExecutor as its first parameter,
+    while the registered tool still exposes executor_id: str. Unknown IDs
+    return EXECUTOR_NOT_FOUND without calling the function.
+    
+    Args:
+        func: Tool function taking the executor as first parameter
+        
+    Returns:
+        Tool function taking executor_id as first parameter
+    """
+    sig = inspect.signature(func)
+    params = list(sig.parameters.values())
+    params[0] = inspect.Parameter(
+        "executor_id",
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        annotation=str
+    )
+    
+    @wraps(func)
+    async def wrapper(executor_id: str, *args, ctx: Context = None, **kwargs):
+        executor = ctx.request_context.lifespan_context.manager.get_executor(executor_id)
+        if executor is None:
+            return EXECUTOR_NOT_FOUND
+        return await func(executor, *args, ctx=ctx, **kwargs)
+    
+    # Expose the executor_id signature to FastMCP's schema generation
+    wrapper.__signature__ = sig.replace(parameters=params)
+    return wrapper
+
 # Register tools
 @app.tool()
 async def create_executor(
@@ -602,8 +1180,9 @@ async def delete_executor(
     }
 
 @app.tool()
+@with_executor
 async def execute_code(
-    executor_id: str,
+    executor: DockerExecutor,
     code: str,
     language: str = "python",
     ctx: Context = None
@@ -620,23 +1199,16 @@ async def execute_code(
     Returns:
         Execution result
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     # Log message
-    ctx.info(f"Executing {language} code in executor {executor_id}")
+    await ctx.info(f"Executing {language} code in executor {executor.id}")
     
-    return await executor.execute_code(code, language)
+    # Stream output to the client as log messages while the code runs
+    return await executor.execute_code(code, language, on_output=ctx.info)
 
 @app.tool()
+@with_executor
 async def write_file(
-    executor_id: str,
+    executor: DockerExecutor,
     file_path: str,
     content: str,
     ctx: Context = None
@@ -653,20 +1225,12 @@ async def write_file(
     Returns:
         Operation result
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     return await executor.write_file(file_path, content)
 
 @app.tool()
+@with_executor
 async def read_file(
-    executor_id: str,
+    executor: DockerExecutor,
     file_path: str,
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -681,20 +1245,12 @@ async def read_file(
     Returns:
         File content
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     return await executor.read_file(file_path)
 
 @app.tool()
+@with_executor
 async def list_directory(
-    executor_id: str,
+    executor: DockerExecutor,
     path: str = ".",
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -709,20 +1265,12 @@ async def list_directory(
     Returns:
         Directory contents
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     return await executor.list_directory(path)
 
 @app.tool()
+@with_executor
 async def create_directory(
-    executor_id: str,
+    executor: DockerExecutor,
     dir_path: str,
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -737,20 +1285,12 @@ async def create_directory(
     Returns:
         Operation result
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     return await executor.create_directory(dir_path)
 
 @app.tool()
+@with_executor
 async def project_structure(
-    executor_id: str,
+    executor: DockerExecutor,
     path: str = ".",
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -765,15 +1305,6 @@ async def project_structure(
     Returns:
         Project structure tree
     """
-    manager = ctx.request_context.lifespan_context.manager
-    executor = manager.get_executor(executor_id)
-    
-    if executor is None:
-        return {
-            "success": False,
-            "message": "Executor not found"
-        }
-    
     return await executor.project_structure(path)
 
 # Add a simple system status resource
@@ -795,25 +1326,33 @@ def generate_tree_structure(file_paths, file_types):
         Tree structure dictionary
     """
     root = {"name": "", "type": "d", "children": {}}
+    # Nodes indexed by path, so each path only looks up its parent once
+    nodes = {"": root}
     
     for path in sorted(file_paths):
         if not path:  # Root directory
             continue
-            
-        parts = path.split("/")
-        current = root
         
-        # Build tree structure
-        for i, part in enumerate(parts):
-            if i == len(parts) - 1:
-                # Leaf node (file or directory)
-                file_type = file_types.get(path, "f")
-                current["children"][part] = {"name": part, "type": file_type, "children": {}}
-            else:
-                # Intermediate directory
-                if part not in current["children"]:
-                    current["children"][part] = {"name": part, "type": "d", "children": {}}
-                current = current["children"][part]
+        parent_path, _, name = path.rpartition("/")
+        parent = nodes.get(parent_path)
+        
+        if parent is None:
+            # Create missing intermediate directories
+            parent = root
+            current_path = ""
+            for part in parent_path.split("/"):
+                current_path = f"{current_path}/{part}" if current_path else part
+                node = nodes.get(current_path)
+                if node is None:
+                    node = {"name": part, "type": "d", "children": {}}
+                    parent["children"][part] = node
+                    nodes[current_path] = node
+                parent = node
+        
+        # Leaf node (file or directory)
+        node = {"name": name, "type": file_types.get(path, "f"), "children": {}}
+        parent["children"][name] = node
+        nodes[path] = node
     
     return root
 
@@ -828,28 +1367,43 @@ def build_tree_output(node, lines, prefix="", is_last=True, is_root=True):
         is_last: Whether this is the last child of its parent
         is_root: Whether this is the root node
     """
-    if not is_root:
-        connector = "└── " if is_last else "├── "
-        lines.append(f"{prefix}{connector}{node['name']}{'' if node['type'] == 'f' else '/'}")
-        
-        # Next level prefix
-        prefix = prefix + ("    " if is_last else "│   ")
-    else:
-        # Root node
-        if "name" in node and node["name"]:
-            lines.append(node["name"] + "/")
-            prefix = ""
+    # Depth-first walk with an explicit stack instead of recursion
+    stack = [(node, prefix, is_last, is_root)]
     
-    # Process child nodes
-    children = list(node["children"].values())
-    for i, child in enumerate(children):
-        build_tree_output(child, lines, prefix, i == len(children) - 1, False)
+    while stack:
+        node, prefix, is_last, is_root = stack.pop()
+        
+        if not is_root:
+            connector = "└── " if is_last else "├── "
+            lines.append(f"{prefix}{connector}{node['name']}{'' if node['type'] == 'f' else '/'}")
+            
+            # Next level prefix
+            prefix = prefix + ("    " if is_last else "│   ")
+        else:
+            # Root node
+            if "name" in node and node["name"]:
+                lines.append(node["name"] + "/")
+                prefix = ""
+        
+        # Push child nodes in reverse so they are emitted in order
+        children = list(node["children"].values())
+        last = len(children) - 1
+        for i in range(last, -1, -1):
+            stack.append((children[i], prefix, i == last, False))
 
 # Main entry point
 if __name__ == "__main__":
     # Use MCP library's run method to start the server
     logger.info("Starting Docker Code Executor MCP server...")
     
+    # Run on uvloop when it is available, app.run() starts the loop through anyio
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+    
     if os.environ.get("MCP_SSE_MODE", "false").lower() == "true":
         app.run(transport="sse")
     else: